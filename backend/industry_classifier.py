@@ -4,21 +4,25 @@ Industry classifier for Sigma Gloves.
 - Reads industry definitions from data/industry_keywords.json
 - Tries Ollama llama3.1:8b to pick the best industry for a free-text prompt
 - Falls back to a heuristic scorer when Ollama is unavailable or uncertain
+- Skips Ollama when the heuristic alone is clearly sure (source "heuristic-fast")
 - CLI usage:
 
     python backend/industry_classifier.py "I need welding gloves"
     python backend/industry_classifier.py "مکانیک هستم" --no-llm
+    python backend/industry_classifier.py "I need welding gloves" --heuristic-sure 6.4 --heuristic-margin 4.8
 
 Output example (JSON):
 {
-  "code": "welding",
-  "name_en": "Welding",
-  "name_fa": "جوشکاری",
-  "score": 0.94,
+  "code": "welding_specialist",
+  "name_en": "Welding Specialist",
+  "name_fa": "جوشکاری تخصصی",
+  "score": 0.9,
   "source": "llm",
   "reason": "Matched welding related terms"
 }
 
+A single keyword match ("welding" above scores 3.2 for metalwork) is never enough to skip the LLM.
+
 The module does not require Ollama to be installed to run; it will gracefully
 fall back to the heuristic matcher.
 """
@@ -26,79 +30,202 @@ fall back to the heuristic matcher.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import http.client
 import json
 import logging
+import operator
 import os
-import re
+import pickle
 import sys
+import threading
 import urllib.error
-import urllib.request
+import urllib.parse
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:  # Optional: faster JSON for the data file and Ollama responses
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # Optional: typed, single-call decoding of the LLM answer
+    import msgspec
+except ImportError:  # pragma: no cover - depends on environment
+    msgspec = None
 
 LOGGER = logging.getLogger(__name__)
 DEFAULT_DATA_PATH = os.path.join("data", "industry_keywords.json")
 DEFAULT_OLLAMA_MODEL = "llama3.1:8b"
 DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+# Bump when the pickled index layout changes
+_INDEX_CACHE_VERSION = 9
+# Heuristic scoring backends accepted by IndustryClassifier(scorer=...) and --scorer
+_SCORERS = ("python", "scipy", "numba")
+# Key of the terminal entry in phrase-trie nodes; tokens are never empty
+_TRIE_END = ""
 
 
 _ARABIC_MAP = str.maketrans({"ي": "ی", "ك": "ک", "أ": "ا", "إ": "ا", "آ": "ا", "ۀ": "ه", "ة": "ه"})
-_NON_WORDS = re.compile(r"[^\u0600-\u06FFa-z0-9\s\-\/]+", re.IGNORECASE)
-_MULTI_SPACE = re.compile(r"\s+")
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: object) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+def _is_word_char(ch: str) -> bool:
+    return "\u0600" <= ch <= "\u06FF" or ("a" <= ch <= "z") or ("0" <= ch <= "9")
+
+
+def _clean_char(cp: int) -> str:
+    return "".join(ch if _is_word_char(ch) else " " for ch in chr(cp).lower())
+
+
+class _CleanTable(dict):
+    """str.translate table that lower-cases, folds Arabic letters and maps every non-word character to a space.
+
+    Latin-1, the Arabic block and General Punctuation (ZWNJ, typographic quotes) are precomputed. Other
+    codepoints are resolved on each use and not stored, so user input cannot grow the table.
+    """
+
+    def __missing__(self, cp: int) -> str:
+        return _clean_char(cp)
+
+
+_CLEAN_TABLE = _CleanTable(
+    (cp, _clean_char(cp)) for block in (range(0x100), range(0x0600, 0x0700), range(0x2000, 0x2070)) for cp in block
+)
+_CLEAN_TABLE.update(_ARABIC_MAP)
 
 
 def normalize_text(text: Optional[str]) -> str:
     """Normalize Persian/English text for robust matching."""
     if text is None:
         return ""
-    s = str(text)
-    s = s.translate(_ARABIC_MAP)
-    s = s.lower()
-    s = _NON_WORDS.sub(" ", s)
-    s = s.replace("-", " ").replace("/", " ")
-    s = _MULTI_SPACE.sub(" ", s).strip()
-    return s
+    # Every separator is a plain space after translate, so split/join collapses runs and trims the ends
+    return " ".join(str(text).translate(_CLEAN_TABLE).split())
+
+
+def _tokens(normalized: str) -> FrozenSet[str]:
+    return frozenset(t for t in normalized.split(" ") if len(t) >= 2)
 
 
 def tokens_of(text: Optional[str]) -> List[str]:
     return [t for t in normalize_text(text).split(" ") if len(t) >= 2]
 
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _normalize_and_tokenize(text: Optional[str]) -> Tuple[str, FrozenSet[str]]:
+    """Normalized text and its distinct tokens from a single normalization pass."""
+    normalized = normalize_text(text)
+    return normalized, _tokens(normalized)
+
+
+_popcount = int.bit_count  # C-level popcount
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_score_all():
+    """Import numba and compile the scoring kernel on first use; None when numba is not installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(nogil=True)
+    def count_common(a, b):  # pragma: no cover - compiled
+        """Size of the intersection of two sorted, duplicate-free id arrays."""
+        i = j = count = 0
+        while i < a.shape[0] and j < b.shape[0]:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+
+    @numba.njit(nogil=True)
+    def score_all(
+        query_ids, kw_ids_flat, kw_offsets, sample_ids_flat, sample_offsets, phrase_hits, length_bonus
+    ):  # pragma: no cover - compiled
+        """Compiled twin of IndustryClassifier._score_industry over all industries.
+
+        Returns (best index, best score, runner-up score).
+        """
+        best = -1
+        best_score = -1.0
+        runner_up = -1.0
+        for k in range(kw_offsets.shape[0] - 1):
+            keyword_hits = count_common(query_ids, kw_ids_flat[kw_offsets[k] : kw_offsets[k + 1]])
+            sample_hits = count_common(query_ids, sample_ids_flat[sample_offsets[k] : sample_offsets[k + 1]])
+            score = phrase_hits[k] * 1.4 + keyword_hits * 1.0 + sample_hits * 0.6 + length_bonus[k]
+            if score > best_score:
+                runner_up = best_score
+                best_score = score
+                best = k
+            elif score > runner_up:
+                runner_up = score
+        return best, best_score, runner_up
+
+    return score_all
+
+
+if msgspec is not None:
+
+    class LLMResult(msgspec.Struct):
+        """Shape of the JSON answer requested from the LLM."""
+
+        code: Optional[str] = None
+        confidence: float = 0.0
+        reason: Optional[str] = None
+
+
+@dataclass(slots=True)
 class Industry:
     code: str
     name_fa: str
     name_en: str
-    keywords_fa: List[str] = field(default_factory=list)
-    keywords_en: List[str] = field(default_factory=list)
-    samples_fa: List[str] = field(default_factory=list)
-    samples_en: List[str] = field(default_factory=list)
-    keyword_tokens: set = field(default_factory=set)
-    sample_tokens: set = field(default_factory=set)
+    # Normalized, interned strings; the raw keyword/sample lists are not kept after loading
+    keyword_tokens: FrozenSet[str] = field(default_factory=frozenset)
+    sample_tokens: FrozenSet[str] = field(default_factory=frozenset)
     phrases: List[str] = field(default_factory=list)
+    # Bitsets over the classifier's token ids; filled in by IndustryClassifier
+    keyword_mask: int = field(default=0, repr=False)
+    sample_mask: int = field(default=0, repr=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "Industry":
-        keywords_fa = data.get("keywords_fa", []) or []
-        keywords_en = data.get("keywords_en", []) or []
-        samples_fa = data.get("samples_fa", []) or []
-        samples_en = data.get("samples_en", []) or []
-        all_keywords = keywords_fa + keywords_en
-        all_samples = samples_fa + samples_en
+        # Load-time strings are seen once, so they skip _normalize_and_tokenize, whose lru cache is meant for prompts
+        all_keywords = (data.get("keywords_fa", []) or []) + (data.get("keywords_en", []) or [])
+        all_samples = (data.get("samples_fa", []) or []) + (data.get("samples_en", []) or [])
         return cls(
             code=str(data.get("code", "")).strip(),
             name_fa=str(data.get("name_fa", "")).strip(),
             name_en=str(data.get("name_en", "")).strip(),
-            keywords_fa=keywords_fa,
-            keywords_en=keywords_en,
-            samples_fa=samples_fa,
-            samples_en=samples_en,
-            keyword_tokens=set(tokens_of(" ".join(all_keywords))),
-            sample_tokens=set(tokens_of(" ".join(all_samples))),
-            phrases=[normalize_text(p) for p in (all_keywords + all_samples)],
+            keyword_tokens=frozenset(map(sys.intern, _tokens(normalize_text(" ".join(all_keywords))))),
+            sample_tokens=frozenset(map(sys.intern, _tokens(normalize_text(" ".join(all_samples))))),
+            # Unique, non-empty phrases, longest (most specific) first
+            phrases=sorted(
+                {sys.intern(n) for n in (normalize_text(p) for p in (all_keywords + all_samples)) if n},
+                key=lambda p: (-len(p), p),
+            ),
         )
 
 
+# (normalized prompt, use_llm, min_llm_score, heuristic_sure_threshold, heuristic_sure_margin)
+_ResultKey = Tuple[str, bool, float, float, float]
+
+
 class IndustryClassifier:
     def __init__(
         self,
@@ -106,36 +233,245 @@ class IndustryClassifier:
         ollama_model: str = DEFAULT_OLLAMA_MODEL,
         ollama_host: str = DEFAULT_OLLAMA_HOST,
         timeout: int = 15,
+        use_cache: bool = True,
+        result_cache_size: int = 1024,
+        heuristic_sure_threshold: float = 6.4,
+        heuristic_sure_margin: float = 4.8,
+        scorer: str = "python",
     ) -> None:
         self.data_path = data_path
         self.ollama_model = ollama_model
         self.ollama_host = ollama_host.rstrip("/")
         self.timeout = timeout
-        self.industries: List[Industry] = self._load_industries(data_path)
+        # The LLM call is skipped when the heuristic score reaches the threshold and leads the runner-up by at
+        # least the margin. A single keyword match scores 3.2, so the defaults need two matches and a clear lead.
+        self.heuristic_sure_threshold = heuristic_sure_threshold
+        self.heuristic_sure_margin = heuristic_sure_margin
+        # Heuristic backend: "python" (integer bitsets), or opt-in "scipy" / "numba". The accelerated ones
+        # are imported on first use since importing them costs far more than they save on a short CLI run.
+        if scorer not in _SCORERS:
+            raise ValueError(f"Unknown scorer {scorer!r}; expected one of {', '.join(_SCORERS)}")
+        self.scorer = scorer
+        self._local = threading.local()  # per-thread keep-alive connection to Ollama
+        # LRU of classification results keyed on (normalized prompt, use_llm, min_llm_score, sure threshold/margin)
+        self._results: "OrderedDict[_ResultKey, Dict[str, object]]" = OrderedDict()
+        self._results_size = result_cache_size
+        self._results_lock = threading.Lock()
+        state = self._load_index(data_path, use_cache)
+        self.industries: List[Industry] = state["industries"]
         self.index: Dict[str, Industry] = {ind.code: ind for ind in self.industries}
+        self._phrase_trie: Dict[str, object] = state["phrase_trie"]
+        self._token_index: Dict[str, int] = state["token_index"]
+        self._matrices = None  # built on first use of the scipy scorer
+        self._kernel_arrays = None  # built on first use of the numba scorer
+        # The catalog part of the LLM prompt does not depend on the user text
+        self._catalog = "; ".join(f"{ind.code}: {ind.name_en}" for ind in self.industries)
+        self._llm_prompt_prefix = "You classify a short work description into an industry code for selecting protective gloves.\n" "Choose exactly one code from the catalog below. Respond with compact JSON only.\n" "Catalog: " + self._catalog + "\n" "Rules: If unsure, return code=null and confidence=0. Include a short reason." "User: "
 
     # ---------- Public API ----------
     def classify_industry(self, prompt: str, use_llm: bool = True, min_llm_score: float = 0.28) -> Dict[str, object]:
         """Classify a user prompt into an industry."""
-        normalized = normalize_text(prompt)
-        token_set = set(tokens_of(prompt))
+        key, heuristic_best, final = self._begin_classify(prompt, use_llm, min_llm_score)
+        if final is not None:
+            return final
+        try:
+            llm_pick = self._llm_pick(prompt)
+        except Exception as exc:  # noqa: BLE001
+            return self._llm_failed(heuristic_best, exc)
+        return self._finish_classify(key, heuristic_best, llm_pick, min_llm_score)
 
-        heuristic_best = self._heuristic_best(normalized, token_set)
-        best = heuristic_best
+    async def classify_many(
+        self,
+        prompts: Iterable[str],
+        use_llm: bool = True,
+        min_llm_score: float = 0.28,
+        concurrency: int = 8,
+    ) -> List[Dict[str, object]]:
+        """Classify several prompts concurrently, keeping at most `concurrency` Ollama requests in flight.
+
+        Uses aiohttp when installed; otherwise runs classify_industry in worker threads. A prompt whose
+        classification fails falls back to the heuristic result instead of failing the whole batch.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            aiohttp = None
+        prompts = list(prompts)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def classify_in_thread(prompt: str) -> Dict[str, object]:
+            async with semaphore:
+                return await asyncio.to_thread(self.classify_industry, prompt, use_llm, min_llm_score)
+
+        async def classify_with_session(session, prompt: str) -> Dict[str, object]:
+            key, heuristic_best, final = self._begin_classify(prompt, use_llm, min_llm_score)
+            if final is not None:
+                return final
+            try:
+                async with semaphore:
+                    llm_pick = await self._llm_pick_async(session, prompt)
+            except Exception as exc:  # noqa: BLE001
+                return self._llm_failed(heuristic_best, exc)
+            return self._finish_classify(key, heuristic_best, llm_pick, min_llm_score)
+
+        async def classify_one(session, prompt: str) -> Dict[str, object]:
+            try:
+                if session is None:
+                    return await classify_in_thread(prompt)
+                return await classify_with_session(session, prompt)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.debug("Classification failed for %r: %s", prompt, exc)
+                return self._heuristic_best(*_normalize_and_tokenize(prompt))[0]
+
+        if aiohttp is None:
+            return list(await asyncio.gather(*(classify_one(None, p) for p in prompts)))
+        async with aiohttp.ClientSession() as session:
+            return list(await asyncio.gather(*(classify_one(session, p) for p in prompts)))
+
+    # ---------- Pipeline ----------
+    def _begin_classify(
+        self, prompt: str, use_llm: bool, min_llm_score: float
+    ) -> Tuple[_ResultKey, Dict[str, object], Optional[Dict[str, object]]]:
+        """Cache lookup and heuristic scoring shared by the sync and async paths.
+
+        Returns the cache key, the heuristic result and, when no LLM call is needed, the final result.
+        """
+        normalized, token_set = _normalize_and_tokenize(prompt)
+        # The sure threshold and margin are public attributes, so they are part of the key in case they change
+        key = (normalized, use_llm, min_llm_score, self.heuristic_sure_threshold, self.heuristic_sure_margin)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return key, cached, cached
+        heuristic_best, runner_up = self._heuristic_best(normalized, token_set)
+        if not (use_llm and prompt and self.industries):
+            return key, heuristic_best, self._store_result(key, heuristic_best)
+        if self._heuristic_is_sure(heuristic_best, runner_up):
+            heuristic_best["source"] = "heuristic-fast"
+            return key, heuristic_best, self._store_result(key, heuristic_best)
+        return key, heuristic_best, None
+
+    def _finish_classify(
+        self,
+        key: _ResultKey,
+        heuristic_best: Dict[str, object],
+        llm_pick: Optional[Dict[str, object]],
+        min_llm_score: float,
+    ) -> Dict[str, object]:
+        return self._store_result(key, self._select_best(heuristic_best, llm_pick, min_llm_score))
+
+    def _llm_failed(self, heuristic_best: Dict[str, object], exc: Exception) -> Dict[str, object]:
+        # Not cached: an Ollama outage or a garbled answer should not pin the heuristic result for this prompt
+        LOGGER.debug("Ollama call failed: %s", exc)
+        return heuristic_best
+
+    # ---------- Result cache ----------
+    def _cached_result(self, key: _ResultKey) -> Optional[Dict[str, object]]:
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is None:
+                return None
+            self._results.move_to_end(key)
+        return dict(result)  # callers may mutate the returned dict
+
+    def _store_result(self, key: _ResultKey, result: Dict[str, object]) -> Dict[str, object]:
+        if self._results_size > 0:
+            with self._results_lock:
+                self._results[key] = dict(result)
+                self._results.move_to_end(key)
+                while len(self._results) > self._results_size:
+                    self._results.popitem(last=False)
+        return result
 
-        if use_llm and prompt and self.industries:
-            llm_pick = self._llm_pick(prompt, heuristic_best)
-            if llm_pick and llm_pick.get("score", 0.0) >= min_llm_score:
-                best = llm_pick
+    # ---------- Loading ----------
+    def _load_index(self, path: str, use_cache: bool) -> Dict[str, object]:
+        """Load the prebuilt index from `<path>.cache.pkl` when it is newer than `path`, else build and save it."""
+        cache_path = path + ".cache.pkl"
+        state = self._read_index_cache(path, cache_path) if use_cache else None
+        if state is None:
+            state = self._build_index(self._load_industries(path))
+            if use_cache:
+                self._write_index_cache(cache_path, state)
+        return state
+
+    def _build_index(self, industries: List[Industry]) -> Dict[str, object]:
+        token_index = self._build_token_index(industries)
+        for ind in industries:
+            ind.keyword_mask = self._token_mask(ind.keyword_tokens, token_index)
+            ind.sample_mask = self._token_mask(ind.sample_tokens, token_index)
+        return {
+            "industries": industries,
+            "phrase_trie": self._build_phrase_trie(industries),
+            "token_index": token_index,
+        }
 
-        return best
+    def _cache_header(self) -> Tuple[object, ...]:
+        return (_INDEX_CACHE_VERSION,)
+
+    def _read_index_cache(self, path: str, cache_path: str) -> Optional[Dict[str, object]]:
+        try:
+            if os.path.getmtime(cache_path) <= os.path.getmtime(path):
+                return None
+            with open(cache_path, "rb") as f:
+                header, state = pickle.load(f)
+            if header != self._cache_header():
+                return None
+            return {
+                "industries": [self._industry_from_row(row) for row in state["industries"]],
+                "phrase_trie": state["phrase_trie"],
+                "token_index": state["token_index"],
+            }
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.debug("Index cache unavailable (%s): %s", cache_path, exc)
+            return None
+
+    def _write_index_cache(self, cache_path: str, state: Dict[str, object]) -> None:
+        # Only builtins are pickled: an Industry instance would be stored under the module name it was
+        # loaded as (__main__ for the CLI), so the CLI and library imports would keep rejecting each other's cache
+        plain = dict(state, industries=[self._industry_to_row(ind) for ind in state["industries"]])
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self._cache_header(), plain), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.debug("Could not write index cache (%s): %s", cache_path, exc)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _industry_to_row(ind: Industry) -> Tuple[object, ...]:
+        return (
+            ind.code,
+            ind.name_fa,
+            ind.name_en,
+            tuple(ind.keyword_tokens),
+            tuple(ind.sample_tokens),
+            tuple(ind.phrases),
+            ind.keyword_mask,
+            ind.sample_mask,
+        )
+
+    @staticmethod
+    def _industry_from_row(row: Tuple[object, ...]) -> Industry:
+        code, name_fa, name_en, keyword_tokens, sample_tokens, phrases, keyword_mask, sample_mask = row
+        return Industry(
+            code=code,
+            name_fa=name_fa,
+            name_en=name_en,
+            keyword_tokens=frozenset(map(sys.intern, keyword_tokens)),
+            sample_tokens=frozenset(map(sys.intern, sample_tokens)),
+            phrases=[sys.intern(p) for p in phrases],
+            keyword_mask=keyword_mask,
+            sample_mask=sample_mask,
+        )
 
-    # ---------- Loading ----------
     def _load_industries(self, path: str) -> List[Industry]:
         if not os.path.exists(path):
             raise FileNotFoundError(f"Industry data not found: {path}")
-        with open(path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with open(path, "rb") as f:
+            raw = _json_loads(f.read())
         industries: List[Industry] = []
         for item in raw:
             ind = Industry.from_dict(item)
@@ -143,15 +479,113 @@ class IndustryClassifier:
                 industries.append(ind)
         return industries
 
+    def _build_phrase_trie(self, industries: List[Industry]) -> Dict[str, object]:
+        """Token-level trie over all phrases; a terminal node maps the phrase to {industry code: weight}."""
+        trie: Dict[str, object] = {}
+        for ind in industries:
+            for phrase in ind.phrases:
+                node = trie
+                for token in phrase.split(" "):
+                    node = node.setdefault(sys.intern(token), {})
+                _, weights = node.setdefault(_TRIE_END, (phrase, {}))
+                weights[ind.code] = weights.get(ind.code, 0) + 1
+        return trie
+
+    def _build_token_index(self, industries: List[Industry]) -> Dict[str, int]:
+        """Assign a stable integer id to every keyword/sample token."""
+        token_index: Dict[str, int] = {}
+        for ind in industries:
+            for t in sorted(ind.keyword_tokens | ind.sample_tokens):
+                token_index.setdefault(t, len(token_index))
+        return token_index
+
+    @staticmethod
+    def _token_mask(tokens: Iterable[str], token_index: Dict[str, int]) -> int:
+        """Bitset of the known token ids among `tokens`."""
+        return functools.reduce(operator.or_, (1 << token_index[t] for t in tokens if t in token_index), 0)
+
+    def _build_matrices(self, industries: List[Industry], token_index: Dict[str, int]):
+        """Build sparse industry x token matrices for keyword/sample hits, plus the length-bonus vector."""
+        import numpy as np
+        from scipy import sparse
+
+        shape = (len(industries), len(token_index))
+
+        def to_matrix(token_sets):
+            rows, cols = [], []
+            for row, tokens in enumerate(token_sets):
+                for t in tokens:
+                    rows.append(row)
+                    cols.append(token_index[t])
+            return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+
+        kw_matrix = to_matrix(ind.keyword_tokens for ind in industries)
+        sample_matrix = to_matrix(ind.sample_tokens for ind in industries)
+        length_bonus = np.minimum(np.array([len(ind.keyword_tokens) for ind in industries]) / 80.0, 0.2)
+        return kw_matrix, sample_matrix, length_bonus
+
+    def _build_kernel_arrays(self, industries: List[Industry], token_index: Dict[str, int]):
+        """Pack sorted per-industry token ids into flat arrays for the numba kernel."""
+        import numpy as np
+
+        def pack(token_sets):
+            ids: List[int] = []
+            offsets = [0]
+            for tokens in token_sets:
+                ids.extend(sorted(token_index[t] for t in tokens))
+                offsets.append(len(ids))
+            return np.array(ids, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+        kw_ids_flat, kw_offsets = pack(ind.keyword_tokens for ind in industries)
+        sample_ids_flat, sample_offsets = pack(ind.sample_tokens for ind in industries)
+        length_bonus = np.array([min(len(ind.keyword_tokens) / 80.0, 0.2) for ind in industries])
+        return kw_ids_flat, kw_offsets, sample_ids_flat, sample_offsets, length_bonus
+
     # ---------- Heuristic scorer ----------
-    def _heuristic_best(self, normalized_text: str, token_set: set) -> Dict[str, object]:
+    def _phrase_hits(self, normalized_text: str) -> Dict[str, int]:
+        """Count whole-word phrase matches per industry code, walking the phrase trie from every token."""
+        tokens = normalized_text.split(" ") if normalized_text else []
+        matched: Dict[str, Dict[str, int]] = {}
+        for start in range(len(tokens)):
+            node = self._phrase_trie
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                terminal = node.get(_TRIE_END)
+                if terminal is not None:
+                    # Keep walking: longer phrases sharing this prefix count as well
+                    phrase, weights = terminal
+                    matched[phrase] = weights
+        hits: Dict[str, int] = {}
+        for weights in matched.values():
+            for code, weight in weights.items():
+                hits[code] = hits.get(code, 0) + weight
+        return hits
+
+    def _heuristic_best(self, normalized_text: str, token_set: FrozenSet[str]) -> Tuple[Dict[str, object], float]:
+        """Best industry as a result dict, plus the runner-up's score (-1.0 when there is none)."""
         best = None
         best_score = -1.0
-        for ind in self.industries:
-            score = self._score_industry(ind, normalized_text, token_set)
-            if score > best_score:
-                best_score = score
-                best = ind
+        runner_up = -1.0
+        phrase_hits = self._phrase_hits(normalized_text)
+        scored = None
+        if self.scorer == "numba" and self.industries:
+            scored = self._compiled_best(token_set, phrase_hits)
+        elif self.scorer == "scipy" and self.industries:
+            scored = self._vector_best(token_set, phrase_hits)
+        if scored is not None:
+            best, best_score, runner_up = scored
+        else:
+            query_mask = self._token_mask(token_set, self._token_index)
+            for ind in self.industries:
+                score = self._score_industry(ind, query_mask, phrase_hits.get(ind.code, 0))
+                if score > best_score:
+                    runner_up = best_score
+                    best_score = score
+                    best = ind
+                elif score > runner_up:
+                    runner_up = score
         result = (
             self._build_result(best, best_score, source="heuristic")
             if best
@@ -164,32 +598,99 @@ class IndustryClassifier:
                 "reason": "No industries found",
             }
         )
-        return result
+        return result, runner_up
 
-    def _score_industry(self, ind: Industry, normalized_text: str, token_set: set) -> float:
-        phrase_hits = sum(1 for p in ind.phrases if p and p in normalized_text)
-        keyword_hits = len(token_set & ind.keyword_tokens)
-        sample_hits = len(token_set & ind.sample_tokens)
-        length_bonus = min(len(ind.keyword_tokens) / 80.0, 0.2)
-        score = phrase_hits * 1.4 + keyword_hits * 1.0 + sample_hits * 0.6 + length_bonus
-        return score
+    def _compiled_best(self, token_set: FrozenSet[str], phrase_hits: Dict[str, int]):
+        """Score every industry with the numba kernel; same formula as _score_industry.
 
-    # ---------- Ollama LLM ----------
-    def _llm_pick(self, user_text: str, heuristic_best: Dict[str, object]) -> Optional[Dict[str, object]]:
-        catalog = "; ".join(f"{ind.code}: {ind.name_en}" for ind in self.industries)
-        prompt = "You classify a short work description into an industry code for selecting protective gloves.\n" "Choose exactly one code from the catalog below. Respond with compact JSON only.\n" "Catalog: " + catalog + "\n" "Rules: If unsure, return code=null and confidence=0. Include a short reason." "User: " + user_text
+        Returns None (and falls back to the bitset loop from then on) when numba is missing or fails.
+        """
         try:
-            response_text = self._ollama_generate(prompt)
+            import numpy as np
+
+            score_all = _numba_score_all()
+            if score_all is None:
+                raise ImportError("numba is not installed")
+            if self._kernel_arrays is None:
+                self._kernel_arrays = self._build_kernel_arrays(self.industries, self._token_index)
+            kw_ids_flat, kw_offsets, sample_ids_flat, sample_offsets, length_bonus = self._kernel_arrays
+            query_ids = np.array(
+                sorted(self._token_index[t] for t in token_set if t in self._token_index), dtype=np.int64
+            )
+            phrases = np.array([phrase_hits.get(ind.code, 0) for ind in self.industries], dtype=np.float64)
+            idx, score, runner_up = score_all(
+                query_ids, kw_ids_flat, kw_offsets, sample_ids_flat, sample_offsets, phrases, length_bonus
+            )
         except Exception as exc:  # noqa: BLE001
-            LOGGER.debug("Ollama call failed: %s", exc)
+            LOGGER.warning("numba scorer unavailable, using the pure-Python scorer: %s", exc)
+            self.scorer = "python"
             return None
+        return self.industries[int(idx)], float(score), float(runner_up)
+
+    def _vector_best(self, token_set: FrozenSet[str], phrase_hits: Dict[str, int]):
+        """Score every industry at once with sparse mat-vec products; same formula as _score_industry.
 
-        parsed = self._extract_json_obj(response_text)
-        if not parsed or "code" not in parsed:
+        Returns None (and falls back to the bitset loop from then on) when numpy/scipy are missing or fail.
+        """
+        try:
+            import numpy as np
+
+            if self._matrices is None:
+                self._matrices = self._build_matrices(self.industries, self._token_index)
+            kw_matrix, sample_matrix, length_bonus = self._matrices
+            query = np.zeros(len(self._token_index))
+            for t in token_set:
+                idx = self._token_index.get(t)
+                if idx is not None:
+                    query[idx] = 1.0
+            phrases = np.array([phrase_hits.get(ind.code, 0) for ind in self.industries], dtype=float)
+            keyword_hits = kw_matrix @ query
+            sample_hits = sample_matrix @ query
+            scores = phrases * 1.4 + keyword_hits * 1.0 + sample_hits * 0.6 + length_bonus
+            idx = int(np.argmax(scores))
+            runner_up = float(np.partition(scores, -2)[-2]) if len(scores) > 1 else -1.0
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("scipy scorer unavailable, using the pure-Python scorer: %s", exc)
+            self.scorer = "python"
             return None
+        return self.industries[idx], float(scores[idx]), runner_up
+
+    def _heuristic_is_sure(self, heuristic_best: Dict[str, object], runner_up: float) -> bool:
+        """True when the heuristic is confident enough to skip the LLM: a high score with a clear lead."""
+        score = float(heuristic_best.get("score") or 0.0)
+        return score >= self.heuristic_sure_threshold and score - runner_up >= self.heuristic_sure_margin
+
+    def _score_industry(self, ind: Industry, query_mask: int, phrase_hits: int) -> float:
+        keyword_hits = _popcount(query_mask & ind.keyword_mask)
+        sample_hits = _popcount(query_mask & ind.sample_mask)
+        length_bonus = min(len(ind.keyword_tokens) / 80.0, 0.2)
+        score = phrase_hits * 1.4 + keyword_hits * 1.0 + sample_hits * 0.6 + length_bonus
+        return score
+
+    # ---------- Ollama LLM ----------
+    def _llm_prompt(self, user_text: str) -> str:
+        return self._llm_prompt_prefix + user_text
+
+    def _llm_pick(self, user_text: str) -> Optional[Dict[str, object]]:
+        """Ask Ollama for a pick; raises when the call or the answer's parsing fails."""
+        return self._parse_llm_response(self._ollama_generate(self._llm_prompt(user_text)))
+
+    async def _llm_pick_async(self, session, user_text: str) -> Optional[Dict[str, object]]:
+        response_text = await self._ollama_generate_async(session, self._llm_prompt(user_text))
+        return self._parse_llm_response(response_text)
+
+    def _parse_llm_response(self, response_text: str) -> Optional[Dict[str, object]]:
+        decoded = self._decode_llm_result(response_text)
+        if decoded is not None:
+            code, confidence, reason = decoded.code, decoded.confidence, decoded.reason
+        else:
+            parsed = self._extract_json_obj(response_text)
+            if not parsed or "code" not in parsed:
+                return None
+            code = parsed.get("code")
+            confidence = float(parsed.get("confidence", 0) or 0)
+            reason = parsed.get("reason")
 
-        code = parsed.get("code")
-        confidence = float(parsed.get("confidence", 0) or 0)
         if not code:
             return None
 
@@ -198,35 +699,153 @@ class IndustryClassifier:
             return None
 
         score = max(confidence, 0.65)  # trust LLM a bit more when it is certain
-        return self._build_result(ind, score, source="llm", reason=parsed.get("reason"))
+        return self._build_result(ind, score, source="llm", reason=reason)
 
-    def _ollama_generate(self, prompt: str) -> str:
-        payload = {
+    def _decode_llm_result(self, response_text: str):
+        """Decode a JSON-mode answer straight into LLMResult; None when msgspec is missing or it does not fit."""
+        if msgspec is None or not response_text:
+            return None
+        try:
+            return msgspec.json.decode(response_text, type=LLMResult)
+        except msgspec.DecodeError:
+            # Chatter around the object or loosely typed fields: let the scanner have a go
+            return None
+
+    def _ollama_payload(self, prompt: str) -> Dict[str, object]:
+        return {
             "model": self.ollama_model,
             "prompt": prompt,
-            "stream": False,
-            "options": {"temperature": 0},
+            "stream": True,
+            "format": "json",
+            "options": {"temperature": 0, "num_predict": 128},
         }
-        data = json.dumps(payload).encode("utf-8")
+
+    def _append_stream_line(self, buffer: str, line: bytes) -> Tuple[str, bool, bool]:
+        """Add one streamed chunk to the buffer.
+
+        Returns the new buffer, whether the stream is done and whether the buffer already holds a JSON object.
+        """
+        if not line.strip():
+            return buffer, False, False
+        chunk = _json_loads(line)
+        piece = chunk.get("response", "")
+        buffer += piece
+        # An object can only have been completed by a chunk that carries a closing brace
+        complete = "}" in piece and self._extract_json_obj(buffer) is not None
+        return buffer, bool(chunk.get("done")), complete
+
+    def _ollama_connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            parts = urllib.parse.urlsplit(self.ollama_host)
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(parts.hostname or "localhost", parts.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_ollama_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _ollama_request(self, path: str, body: bytes) -> http.client.HTTPResponse:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(2):
+            conn = self._ollama_connection()
+            reused = conn.sock is not None
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                return conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server may have closed an idle keep-alive socket; retry once on a fresh one
+                self._drop_ollama_connection()
+                if not reused or attempt:
+                    raise
+            except Exception:
+                self._drop_ollama_connection()
+                raise
+        raise AssertionError("unreachable")
+
+    def _ollama_generate(self, prompt: str) -> str:
+        data = _json_dumps(self._ollama_payload(prompt))
+        path = urllib.parse.urlsplit(self.ollama_host).path.rstrip("/") + "/api/generate"
+        resp = self._ollama_request(path, data)
+        if resp.status >= 400:
+            resp.read()
+            raise urllib.error.HTTPError(self.ollama_host + path, resp.status, resp.reason, resp.headers, None)
+        buffer = ""
+        try:
+            # Streamed as one JSON object per line; stop as soon as a complete answer object arrived.
+            for line in resp:
+                buffer, done, complete = self._append_stream_line(buffer, line)
+                if done:
+                    resp.read()  # consume the chunked terminator so the connection can be reused
+                    break
+                if complete:
+                    # JSON mode may keep emitting whitespace up to num_predict; reconnecting to a local
+                    # server is far cheaper than waiting for those tokens, so drop the connection instead
+                    self._drop_ollama_connection()
+                    break
+        except Exception:
+            self._drop_ollama_connection()
+            raise
+        return buffer
+
+    async def _ollama_generate_async(self, session, prompt: str) -> str:
+        import aiohttp
+
         url = f"{self.ollama_host}/api/generate"
-        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
-        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-            content = resp.read().decode("utf-8")
-        parsed = json.loads(content)
-        return parsed.get("response", "")
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        buffer = ""
+        data = _json_dumps(self._ollama_payload(prompt))
+        headers = {"Content-Type": "application/json"}
+        async with session.post(url, data=data, headers=headers, timeout=timeout) as resp:
+            resp.raise_for_status()
+            async for line in resp.content:
+                buffer, done, complete = self._append_stream_line(buffer, line)
+                if done or complete:
+                    break
+        return buffer
 
     # ---------- Helpers ----------
     def _extract_json_obj(self, text: str) -> Optional[Dict[str, object]]:
         if not text:
             return None
-        # Try to find the first JSON object in the response
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            return None
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            return None
+        # Single pass for the first balanced {...} block; braces inside JSON strings are ignored
+        start = -1
+        depth = 0
+        in_string = False
+        escaped = False
+        for i, c in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"' and depth:
+                in_string = True
+            elif c == "{":
+                if start < 0:
+                    start = i
+                depth += 1
+            elif c == "}" and depth:
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return _json_loads(text[start : i + 1])
+                    except json.JSONDecodeError:
+                        return None
+        return None
+
+    def _select_best(
+        self, heuristic_best: Dict[str, object], llm_pick: Optional[Dict[str, object]], min_llm_score: float
+    ) -> Dict[str, object]:
+        if llm_pick and llm_pick.get("score", 0.0) >= min_llm_score:
+            return llm_pick
+        return heuristic_best
 
     def _build_result(self, ind: Industry, score: float, source: str, reason: Optional[str] = None) -> Dict[str, object]:
         return {
@@ -247,6 +866,24 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--model", default=DEFAULT_OLLAMA_MODEL, help="Ollama model name (default: llama3.1:8b)")
     parser.add_argument("--no-llm", action="store_true", help="Disable Ollama and use heuristic only")
     parser.add_argument("--min-llm-score", type=float, default=0.28, help="Minimum LLM score to override heuristic")
+    parser.add_argument(
+        "--heuristic-sure", type=float, default=6.4, help="Heuristic score at which the LLM call may be skipped"
+    )
+    parser.add_argument(
+        "--heuristic-margin",
+        type=float,
+        default=4.8,
+        help="Lead over the runner-up industry the heuristic also needs to skip the LLM call",
+    )
+    parser.add_argument(
+        "--scorer",
+        choices=_SCORERS,
+        default="python",
+        help=(
+            "Heuristic scoring backend; scipy/numba must be installed. numba JIT-compiles its kernel on every "
+            "run (about a second), so it only pays off in long-running processes"
+        ),
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     return parser
 
@@ -264,6 +901,9 @@ def main(argv: Optional[List[str]] = None) -> int:
         data_path=args.data_path,
         ollama_model=args.model,
         ollama_host=args.ollama_host,
+        heuristic_sure_threshold=args.heuristic_sure,
+        heuristic_sure_margin=args.heuristic_margin,
+        scorer=args.scorer,
     )
 
     result = classifier.classify_industry(args.text, use_llm=not args.no_llm, min_llm_score=args.min_llm_score)
@@ -0,0 +1,249 @@
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import industry_classifier as ic  # noqa: E402
+
+DATA_PATH = os.path.join(ROOT, "data", "industry_keywords.json")
+
+
+def _has(*modules: str) -> bool:
+    return all(importlib.util.find_spec(m) is not None for m in modules)
+
+
+class PhraseMatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = [
+            {
+                "code": "welding",
+                "name_fa": "جوشکاری",
+                "name_en": "Welding",
+                "keywords_fa": ["جوش", "جوش قوسی"],
+                "keywords_en": ["weld", "arc weld"],
+            },
+            {"code": "cold", "name_fa": "سردخانه", "name_en": "Cold storage", "keywords_en": ["freezer"]},
+        ]
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(cls.tmpdir.name, "industries.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        cls.clf = ic.IndustryClassifier(data_path=path, use_cache=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def hits(self, text: str):
+        return self.clf._phrase_hits(ic.normalize_text(text))
+
+    def test_whole_words_match(self):
+        self.assertEqual(self.hits("I weld pipes"), {"welding": 1})
+        self.assertEqual(self.hits("کار من جوش است"), {"welding": 1})
+
+    def test_no_match_inside_a_longer_word(self):
+        self.assertEqual(self.hits("I am a welder"), {})
+        self.assertEqual(self.hits("جوشکارم"), {})
+
+    def test_longer_phrase_counts_with_its_prefix(self):
+        self.assertEqual(self.hits("arc weld"), {"welding": 2})
+        self.assertEqual(self.hits("جوش قوسی"), {"welding": 2})
+
+
+class ScorerParityTest(unittest.TestCase):
+    PROMPTS = [
+        "I need welding gloves",
+        "مکانیک هستم",
+        "Chemical lab work with acids!",
+        "cold storage / freezer",
+        "I'm a gardener-landscaper",
+        "جوشکاری نقطه‌ای و برش پلاسما",
+        "",
+    ]
+
+    def classify_all(self, scorer: str):
+        clf = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False, scorer=scorer)
+        results = [clf._heuristic_best(*ic._normalize_and_tokenize(p)) for p in self.PROMPTS]
+        self.assertEqual(clf.scorer, scorer)  # no silent fallback to the pure-Python scorer
+        return results
+
+    def test_unknown_scorer_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False, scorer="bogus")
+
+    def test_failing_backend_falls_back_to_python(self):
+        expected = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False).classify_industry("welding", False)
+        for scorer, builder in (("scipy", "_build_matrices"), ("numba", "_build_kernel_arrays")):
+            with self.subTest(scorer=scorer):
+                clf = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False, scorer=scorer)
+                with mock.patch.object(clf, builder, side_effect=RuntimeError("boom")), self.assertLogs(ic.LOGGER):
+                    self.assertEqual(clf.classify_industry("welding", use_llm=False), expected)
+                self.assertEqual(clf.scorer, "python")
+
+    @unittest.skipUnless(_has("numpy", "scipy"), "numpy/scipy not installed")
+    def test_scipy_matches_python(self):
+        self.assertEqual(self.classify_all("scipy"), self.classify_all("python"))
+
+    @unittest.skipUnless(_has("numpy", "numba"), "numba not installed")
+    def test_numba_matches_python(self):
+        self.assertEqual(self.classify_all("numba"), self.classify_all("python"))
+
+
+class HeuristicSureTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.clf = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False)
+
+    def is_sure(self, prompt: str) -> bool:
+        return self.clf._heuristic_is_sure(*self.clf._heuristic_best(*ic._normalize_and_tokenize(prompt)))
+
+    def test_single_keyword_match_asks_the_llm(self):
+        best, _ = self.clf._heuristic_best(*ic._normalize_and_tokenize("I need welding gloves"))
+        self.assertEqual(best["score"], 3.2)
+        self.assertFalse(self.is_sure("I need welding gloves"))
+
+    def test_close_runner_up_asks_the_llm(self):
+        # Scores 10.4 for metalwork, but welding_specialist trails by only 4.2
+        self.assertFalse(self.is_sure("TIG welder working with stainless steel"))
+
+    def test_clear_winner_skips_the_llm(self):
+        self.assertTrue(self.is_sure("stage lighting and sound for live events"))
+
+
+class ExtractJsonTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.extract = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False)._extract_json_obj
+
+    def test_plain_object(self):
+        self.assertEqual(self.extract('{"code": "food", "confidence": 0.8}'), {"code": "food", "confidence": 0.8})
+
+    def test_braces_inside_strings(self):
+        text = 'Answer: {"code": "glass", "reason": "uses {curly} and } braces"}'
+        self.assertEqual(self.extract(text), {"code": "glass", "reason": "uses {curly} and } braces"})
+
+    def test_escaped_quotes(self):
+        text = '{"code": "food", "reason": "said \\"hi}\\" twice"}'
+        self.assertEqual(self.extract(text), {"code": "food", "reason": 'said "hi}" twice'})
+        # An escaped backslash right before the closing quote must still end the string
+        self.assertEqual(self.extract('{"reason": "dir C:\\\\", "code": "x"} }'), {"reason": "dir C:\\", "code": "x"})
+
+    def test_trailing_chatter_with_more_braces(self):
+        text = '{"code": "mining"} and then {"code": "glass"} plus a stray }'
+        self.assertEqual(self.extract(text), {"code": "mining"})
+
+    def test_unbalanced_object(self):
+        self.assertIsNone(self.extract('{"code": "mining", "reason": {"nested": 1}'))
+        self.assertIsNone(self.extract(""))
+
+    def test_invalid_first_object(self):
+        # Only the first balanced block is considered; a broken one is not skipped over
+        self.assertIsNone(self.extract('{code: mining} {"code": "glass"}'))
+
+
+class ResultCacheTest(unittest.TestCase):
+    ANSWER = '{"code": "welding_specialist", "confidence": 0.9, "reason": "welding"}'
+
+    def setUp(self):
+        self.clf = ic.IndustryClassifier(data_path=DATA_PATH, use_cache=False)
+        self.generate = mock.patch.object(self.clf, "_ollama_generate", return_value=self.ANSWER).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_cached_result_is_a_copy(self):
+        first = self.clf.classify_industry("I need welding gloves")
+        first["code"] = "mutated"
+        second = self.clf.classify_industry("I need welding gloves")
+        self.assertEqual(second["code"], "welding_specialist")
+        self.assertEqual(self.generate.call_count, 1)
+        second["source"] = "mutated"
+        self.assertEqual(self.clf.classify_industry("I need welding gloves")["source"], "llm")
+
+    def test_failed_llm_call_is_not_cached(self):
+        self.generate.side_effect = OSError("connection refused")
+        result = self.clf.classify_industry("I need welding gloves")
+        self.assertEqual((result["code"], result["source"]), ("metalwork", "heuristic"))
+        self.assertEqual(len(self.clf._results), 0)
+        self.generate.side_effect = None
+        self.assertEqual(self.clf.classify_industry("I need welding gloves")["source"], "llm")
+        self.assertEqual(self.generate.call_count, 2)
+
+    def test_unparsable_llm_answer_is_not_cached(self):
+        self.generate.return_value = '{"code": "welding_specialist", "confidence": "high"}'
+        self.assertEqual(self.clf.classify_industry("I need welding gloves")["source"], "heuristic")
+        self.assertEqual(len(self.clf._results), 0)
+
+    def test_sure_threshold_is_part_of_the_key(self):
+        self.clf.heuristic_sure_threshold = 3.0
+        self.clf.heuristic_sure_margin = 0.0
+        self.assertEqual(self.clf.classify_industry("I need welding gloves")["source"], "heuristic-fast")
+        self.generate.assert_not_called()
+        self.clf.heuristic_sure_threshold = 6.4
+        self.assertEqual(self.clf.classify_industry("I need welding gloves")["source"], "llm")
+        self.assertEqual(self.generate.call_count, 1)
+
+    def test_prompts_that_normalize_alike_share_an_entry(self):
+        self.clf.classify_industry("I need welding gloves")
+        self.clf.classify_industry("  I NEED welding-gloves!! ")
+        self.assertEqual(self.generate.call_count, 1)
+        self.assertEqual(len(self.clf._results), 1)
+
+
+class IndexCacheTest(unittest.TestCase):
+    PROMPTS = ["I need welding gloves", "مکانیک هستم", "cold storage / freezer", "جوشکاری نقطه‌ای و برش پلاسما"]
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.data_path = os.path.join(tmpdir.name, "industry_keywords.json")
+        shutil.copy(DATA_PATH, self.data_path)
+        self.cache_path = self.data_path + ".cache.pkl"
+
+    def load(self):
+        """Build a classifier, reporting whether the JSON had to be parsed (i.e. the cache was not used)."""
+        with mock.patch.object(
+            ic.IndustryClassifier, "_load_industries", autospec=True, side_effect=ic.IndustryClassifier._load_industries
+        ) as load_json:
+            clf = ic.IndustryClassifier(data_path=self.data_path)
+        return clf, load_json.called
+
+    def results(self, clf):
+        return [clf.classify_industry(p, use_llm=False) for p in self.PROMPTS]
+
+    def test_round_trip(self):
+        built, parsed = self.load()
+        self.assertTrue(parsed)
+        self.assertTrue(os.path.exists(self.cache_path))
+        cached, parsed = self.load()
+        self.assertFalse(parsed)
+        self.assertEqual(cached.industries, built.industries)
+        self.assertEqual(cached._token_index, built._token_index)
+        self.assertEqual(self.results(cached), self.results(built))
+
+    def test_newer_json_invalidates_the_cache(self):
+        self.load()
+        stamp = os.path.getmtime(self.cache_path) + 10
+        os.utime(self.data_path, (stamp, stamp))
+        _, parsed = self.load()
+        self.assertTrue(parsed)
+
+    def test_corrupt_cache_is_rebuilt(self):
+        built, _ = self.load()
+        with open(self.cache_path, "wb") as f:
+            f.write(b"not a pickle")
+        rebuilt, parsed = self.load()
+        self.assertTrue(parsed)
+        self.assertEqual(self.results(rebuilt), self.results(built))
+        _, parsed = self.load()  # and the rebuilt cache is usable again
+        self.assertFalse(parsed)
+
+
+if __name__ == "__main__":
+    unittest.main()